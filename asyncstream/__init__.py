@@ -1,5 +1,6 @@
-from asyncstream.stream import SocketStream
+from asyncstream.stream import SocketStream, UnixStream, PipeStream, TLSStream
 from asyncstream.reader import StreamReader
 from asyncstream.writer import StreamWriter
 from asyncstream.factory import Client, Server
+from asyncstream.pipeline import Pipeline, StageStats
 from asyncstream.error import *
@@ -1,13 +1,23 @@
 import asyncio
+import collections
+import functools
+import os
 import socket
+import stat
 
 from . import utils
 from . import stream
 
 
+_DEFAULT_TLS_SESSION_CACHE_SIZE = 256
+_DEFAULT_TLS_HANDSHAKE_TIMEOUT = 60.0
+
+
 class Client:
-    def __init__(self, loop=None):
+    def __init__(self, loop=None, tls_session_cache_size=_DEFAULT_TLS_SESSION_CACHE_SIZE):
         self._loop = loop or asyncio.get_event_loop()
+        self._tls_sessions = collections.OrderedDict()
+        self._tls_session_cache_size = tls_session_cache_size
 
     async def connect(self, host, port, family=socket.AF_UNSPEC, flags=socket.AI_PASSIVE):
         # resolve host address
@@ -20,6 +30,7 @@ class Client:
         # create socket
         addr_family, sock_type, sock_proto, _, sock_addr = addr_info[0]
         sock = utils.create_socket(addr_family, sock_type, sock_proto)
+        sock.setblocking(False)
 
         # connect socket
         await self._loop.sock_connect(sock, sock_addr)
@@ -27,12 +38,73 @@ class Client:
         # return stream
         return stream.SocketStream(sock, self._loop)
 
+    async def connect_tls(self, host, port, ssl_context, server_hostname=None, handshake_executor=None,
+                          family=socket.AF_UNSPEC, flags=socket.AI_PASSIVE):
+        if server_hostname is None:
+            server_hostname = host
+
+        # connect socket
+        sock_stream = await self.connect(host, port, family=family, flags=flags)
+
+        # resume a cached session (or session ticket) for this server, sessions only resume with their own context
+        key = (ssl_context, server_hostname, port)
+        try:
+            tls_stream = stream.TLSStream(sock_stream, ssl_context,
+                                          server_hostname=server_hostname,
+                                          session=self._tls_sessions.get(key),
+                                          session_callback=functools.partial(self._cache_tls_session, key),
+                                          loop=self._loop)
+
+            # perform handshake
+            await tls_stream.handshake(handshake_executor)
+        except BaseException:
+            sock_stream.close()
+            raise
+
+        # return stream
+        return tls_stream
+
+    def _cache_tls_session(self, key, session):
+        if self._tls_session_cache_size <= 0:
+            return
+        self._tls_sessions[key] = session
+        self._tls_sessions.move_to_end(key)
+        while len(self._tls_sessions) > self._tls_session_cache_size:
+            self._tls_sessions.popitem(last=False)
+
+    async def connect_unix(self, path):
+        # create socket
+        sock = utils.create_socket(socket.AF_UNIX, socket.SOCK_STREAM, 0, reuse_addr=False)
+        sock.setblocking(False)
+
+        # connect socket
+        try:
+            await self._loop.sock_connect(sock, path)
+        except BaseException:
+            sock.close()
+            raise
+
+        # return stream
+        return stream.UnixStream(sock, self._loop)
+
+    def open_pipe(self):
+        # create pipe
+        read_fd, write_fd = os.pipe()
+
+        # return streams
+        return stream.PipeStream(read_fd, self._loop), stream.PipeStream(write_fd, self._loop)
+
 
 class Server:
-    def __init__(self, callback, loop=None):
+    def __init__(self, callback, loop=None, ssl_context=None, handshake_executor=None,
+                 handshake_timeout=_DEFAULT_TLS_HANDSHAKE_TIMEOUT):
         self._callback = callback
         self._loop = loop or asyncio.get_event_loop()
+        self._ssl_context = ssl_context
+        self._handshake_executor = handshake_executor
+        self._handshake_timeout = handshake_timeout
         self.sockets = []
+        self._unix_paths = []
 
     async def listen(self, host, port=None, family=socket.AF_UNSPEC, flags=socket.AI_PASSIVE, backlog=100):
         # resolve host address
@@ -55,6 +127,29 @@ class Server:
             s.setblocking(False)
             self._start_serving(s)
 
+    async def listen_unix(self, path, backlog=100):
+        # remove a stale socket file left behind by a previous server
+        try:
+            if stat.S_ISSOCK(os.stat(path).st_mode):
+                os.remove(path)
+        except FileNotFoundError:
+            pass
+
+        # create socket
+        sock = utils.create_socket(socket.AF_UNIX, socket.SOCK_STREAM, 0, reuse_addr=False)
+        try:
+            sock.bind(path)
+            sock.listen(backlog)
+            sock.setblocking(False)
+        except BaseException:
+            sock.close()
+            raise
+        self.sockets.append(sock)
+        self._unix_paths.append(path)
+
+        # start serving
+        self._start_serving(sock)
+
     def _start_serving(self, sock, backlog=100):
         self._loop.add_reader(sock.fileno(), self._accept_connection, sock, backlog)
 
@@ -71,10 +166,25 @@ class Server:
             # create a stream
             client_stream = self._create_stream(conn)
 
-            # run callback
-            self._run_callback(client_stream, addr)
+            # run callback (after the TLS handshake, if serving TLS)
+            if self._ssl_context is not None:
+                self._loop.create_task(self._start_tls(client_stream, addr))
+            else:
+                self._run_callback(client_stream, addr)
+
+    async def _start_tls(self, sock_stream, addr):
+        tls_stream = stream.TLSStream(sock_stream, self._ssl_context, server_side=True, loop=self._loop)
+        try:
+            await asyncio.wait_for(tls_stream.handshake(self._handshake_executor), self._handshake_timeout)
+        except Exception:
+            # drop connections that fail or time out the handshake
+            sock_stream.close()
+            return
+        self._run_callback(tls_stream, addr)
 
     def _create_stream(self, sock):
+        if sock.family == socket.AF_UNIX:
+            return stream.UnixStream(sock, self._loop)
         return stream.SocketStream(sock, self._loop)
 
     def _run_callback(self, *args, **kwargs):
@@ -86,3 +196,11 @@ class Server:
     def close(self):
         for s in self.sockets:
             s.close()
+
+        # remove the socket files created by listen_unix
+        for path in self._unix_paths:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        self._unix_paths.clear()
@@ -0,0 +1,207 @@
+_DEFAULT_QUEUE_SIZE = 64
+
+import asyncio
+
+from . import reader
+from . import writer
+
+# marks the end of the record stream in a stage queue
+_EOF = object()
+
+
+def _apply_batch(func, batch):
+    # module level so that it can be pickled and sent to a process pool
+    return [func(record) for record in batch]
+
+
+class StageStats:
+    def __init__(self, name):
+        """
+        Create a new instance of the StageStats class
+        """
+        self.name = name
+        self.records_in = 0
+        self.records_out = 0
+        self.batches = 0
+        self.busy_time = 0.0
+        self.start_time = None
+        self.end_time = None
+
+    @property
+    def elapsed(self):
+        """
+        Seconds between the first batch dispatched and the last batch processed.
+        """
+        if self.start_time is None or self.end_time is None:
+            return 0.0
+        return self.end_time - self.start_time
+
+    @property
+    def throughput(self):
+        """
+        Records processed per second.
+        """
+        if not self.elapsed:
+            return 0.0
+        return self.records_in / self.elapsed
+
+
+class _Stage:
+    def __init__(self, func, concurrency, executor, batch_size, queue_size):
+        self.func = func
+        self.concurrency = concurrency
+        self.executor = executor
+        self.batch_size = batch_size
+        self.queue_size = queue_size
+        self.queue = None
+        self.stats = StageStats(getattr(func, '__name__', repr(func)))
+
+
+class Pipeline:
+    def __init__(self, source: reader.StreamReader, sink: writer.StreamWriter, separator=b'\n',
+                 queue_size=_DEFAULT_QUEUE_SIZE, loop=None):
+        """
+        Create a new instance of the Pipeline class
+
+        Records are read from source up to and including separator, passed through each stage in turn and
+        written to sink. Stages are connected by bounded queues, so a slow stage or sink stops the source from
+        reading more data.
+        """
+        self._source = source
+        self._sink = sink
+        self._separator = separator
+        self._queue_size = queue_size
+        self._loop = loop or asyncio.get_event_loop()
+        self._stages = []
+        self._sink_queue = None
+
+    @property
+    def stats(self):
+        return [stage.stats for stage in self._stages]
+
+    def add_stage(self, func, concurrency=1, executor=None, batch_size=1, queue_size=None):
+        """
+        Add a stage that applies func to each record.
+
+        If func returns None the record is dropped. If executor is given, batches of up to batch_size records
+        are dispatched to it (a process pool requires func to be picklable). Records are not kept in order when
+        concurrency is greater than one.
+
+        A process pool using the fork start method starts its workers lazily, and they inherit every open file
+        descriptor, including those of the source and sink. The sink is then never seen as closed by its peer.
+        Create the pool with a spawn or forkserver context, or start its workers before opening the streams.
+        """
+        if concurrency < 1:
+            raise ValueError('concurrency should be at least one')
+        if batch_size < 1:
+            raise ValueError('batch_size should be at least one')
+        if queue_size is None:
+            queue_size = self._queue_size
+        self._stages.append(_Stage(func, concurrency, executor, batch_size, queue_size))
+        return self
+
+    async def run(self):
+        """
+        Run the pipeline until the source reaches EOF and all records have been written to the sink.
+        """
+        for stage in self._stages:
+            stage.queue = asyncio.Queue(stage.queue_size)
+            stage.stats = StageStats(stage.stats.name)
+        self._sink_queue = asyncio.Queue(self._queue_size)
+        queues = [stage.queue for stage in self._stages] + [self._sink_queue]
+
+        tasks = [self._loop.create_task(self._read_source(queues[0]))]
+        for stage, output in zip(self._stages, queues[1:]):
+            tasks.append(self._loop.create_task(self._run_stage(stage, output)))
+        tasks.append(self._loop.create_task(self._write_sink(self._sink_queue)))
+
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            # stop every other task if any task fails
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+    async def _read_source(self, output):
+        while True:
+            record = await self._source.read_until(self._separator)
+            if not record:
+                break
+            await output.put(record)
+
+        # a final record without a separator is left in the buffer at EOF
+        record = self._source.read_buffered()
+        if record:
+            await output.put(record)
+        await output.put(_EOF)
+
+    async def _run_stage(self, stage, output):
+        workers = [self._loop.create_task(self._run_worker(stage, output)) for _ in range(stage.concurrency)]
+        try:
+            await asyncio.gather(*workers)
+        except BaseException:
+            for worker in workers:
+                worker.cancel()
+            raise
+        await output.put(_EOF)
+
+    async def _run_worker(self, stage, output):
+        stats = stage.stats
+        while True:
+            # collect a batch of records, waiting only for the first one
+            batch = []
+            eof = False
+            record = await stage.queue.get()
+            while record is not _EOF:
+                batch.append(record)
+                if len(batch) >= stage.batch_size or stage.queue.empty():
+                    break
+                record = stage.queue.get_nowait()
+            else:
+                # put EOF back for the other workers of this stage
+                await stage.queue.put(_EOF)
+                eof = True
+
+            if batch:
+                if stats.start_time is None:
+                    stats.start_time = self._loop.time()
+                stats.records_in += len(batch)
+                stats.batches += 1
+
+                start_time = self._loop.time()
+                if stage.executor is not None:
+                    results = await self._loop.run_in_executor(stage.executor, _apply_batch, stage.func, batch)
+                else:
+                    results = _apply_batch(stage.func, batch)
+                stats.end_time = self._loop.time()
+                stats.busy_time += stats.end_time - start_time
+
+                for result in results:
+                    if result is not None:
+                        stats.records_out += 1
+                        await output.put(result)
+
+            if eof:
+                return
+
+    async def _write_sink(self, queue):
+        while True:
+            # coalesce all records that are ready into a single write
+            chunks = []
+            eof = False
+            record = await queue.get()
+            while record is not _EOF:
+                chunks.append(record)
+                if queue.empty():
+                    break
+                record = queue.get_nowait()
+            else:
+                eof = True
+
+            if chunks:
+                await self._sink.write(b''.join(chunks))
+
+            if eof:
+                return
@@ -95,5 +95,13 @@ class StreamReader:
         del self._read_buffer[:sep_pos + sep_len]
         return bytes(data)
 
+    def read_buffered(self):
+        """
+        Return all buffered bytes without reading from the stream.
+        """
+        data = bytes(self._read_buffer)
+        self._read_buffer.clear()
+        return data
+
     async def read_line(self):
         pass
@@ -1,4 +1,12 @@
+import array
 import asyncio
+import os
+import socket
+
+try:
+    import ssl
+except ImportError:  # pragma: no cover
+    ssl = None
 
 from .error import StreamClosedError
 
@@ -135,7 +143,7 @@ class BaseStream:
 
         # Not all was written, register write handler to send data asynchronously
         self._write_buffer.extend(data)
-        self._loop.add_writer(fd, self._write_ready)
+        self._loop.add_writer(fd, self._write_ready, fd)
         return future
 
     def _write_ready(self, fd):
@@ -156,6 +164,10 @@ class BaseStream:
 
             # clear the write buffer
             self._write_buffer.clear()
+
+            # if we're closing, the write is over so go ahead and close
+            if self._closing:
+                self._close_fd(fd)
         else:
 
             # remove bytes written from the write buffer
@@ -181,8 +193,8 @@ class BaseStream:
             return
         self._closing = True
 
-        # allow pending writes to finish if the write buffer is not empty
-        if not self._write_buffer:
+        # allow pending writes to finish
+        if self._write_future is None:
             self._close_fd(self.fileno())
 
     def _close_fd(self, fd):
@@ -214,3 +226,337 @@ class SocketStream(BaseStream):
 
     def _write_fd(self, fd, data):
         return self._socket.send(data)
+
+
+class UnixStream(SocketStream):
+    def read_fds_async(self, n, maxfds):
+        """
+        Read data and file descriptors (SCM_RIGHTS) asynchronously
+        :param n: maximum number of bytes to read
+        :param maxfds: maximum number of file descriptors to receive
+        :return: a tuple of (data, fds); data is None on EOF
+        """
+        fd = self.fileno()
+        if fd < 0:
+            raise StreamClosedError()
+        future = self._create_read_future()
+        self._loop.add_reader(fd, self._read_fds_ready, fd, n, maxfds)
+        return future
+
+    def _read_fds_ready(self, fd, n, maxfds):
+        """
+        The _read_fds_ready callback is invoked when the stream is ready to read data and file descriptors
+        :param fd:
+        :param n:
+        :param maxfds:
+        :return: None
+        """
+
+        if self._read_future.cancelled():
+            return
+
+        try:
+            data, fds = self._recv_fds(n, maxfds)
+        except (BlockingIOError, InterruptedError):
+            # if reading would block, keep reading
+            pass
+        except Exception as ex:
+            # error reading
+            self._resolve_read_error(ex)
+            self._loop.remove_reader(fd)
+        else:
+            if data:
+                # done reading
+                self._resolve_read((data, fds))
+            else:
+                # done reading (EOF received)
+                self._resolve_read((None, fds))
+                if self._close_eof:
+                    self.close()
+
+            # done reading, remove reader
+            self._loop.remove_reader(fd)
+
+    def _recv_fds(self, n, maxfds):
+        fds = array.array('i')
+        flags = getattr(socket, 'MSG_CMSG_CLOEXEC', 0)
+        data, ancdata, msg_flags, _ = self._socket.recvmsg(n, socket.CMSG_SPACE(maxfds * fds.itemsize), flags)
+        for cmsg_level, cmsg_type, cmsg_data in ancdata:
+            if cmsg_level == socket.SOL_SOCKET and cmsg_type == socket.SCM_RIGHTS:
+                # Append data, ignoring any truncated integers at the end.
+                fds.frombytes(cmsg_data[:len(cmsg_data) - (len(cmsg_data) % fds.itemsize)])
+        return data, list(fds)
+
+    def write_fds_async(self, data, fds):
+        """
+        Write data and file descriptors (SCM_RIGHTS) asynchronously
+        :param data: at least one byte to carry the file descriptors
+        :param fds: file descriptors to send
+        :return:
+        """
+        if not isinstance(data, (bytes, bytearray, memoryview)):
+            raise TypeError('data argument must be a bytes-like object, '
+                            'not %r' % type(data).__name__)
+        if not data:
+            raise ValueError('data must be at least one byte to send file descriptors')
+
+        fd = self.fileno()
+        if fd < 0:
+            raise StreamClosedError()
+
+        fds = list(fds)
+        future = self._create_write_future()
+
+        # Optimization: attempt to send data and file descriptors immediately
+        try:
+            n = self._send_fds(data, fds)
+        except (BlockingIOError, InterruptedError):
+            # if writing would block, send data and file descriptors asynchronously
+            self._loop.add_writer(fd, self._write_fds_ready, fd, data, fds)
+        except Exception as ex:
+            self._resolve_write_error(ex)
+        else:
+            self._write_fds_done(fd, data[n:])
+        return future
+
+    def _write_fds_ready(self, fd, data, fds):
+        if self._write_future.cancelled():
+            return
+
+        try:
+            n = self._send_fds(data, fds)
+        except (BlockingIOError, InterruptedError):
+            # if writing would block, keep writing
+            pass
+        except Exception as ex:
+            # error writing
+            self._resolve_write_error(ex)
+            self._loop.remove_writer(fd)
+
+            # if we're closing, the write is over so go ahead and close
+            if self._closing:
+                self._close_fd(fd)
+        else:
+            self._loop.remove_writer(fd)
+            self._write_fds_done(fd, data[n:])
+
+    def _write_fds_done(self, fd, data):
+        # the file descriptors were sent with the first byte, send the remaining data asynchronously
+        if data:
+            self._write_buffer.extend(data)
+            self._loop.add_writer(fd, self._write_ready, fd)
+            return
+
+        # done writing
+        self._resolve_write(None)
+
+        # if we're closing, now that the write is done go ahead and close
+        if self._closing:
+            self._close_fd(fd)
+
+    def _send_fds(self, data, fds):
+        return self._socket.sendmsg([data], [(socket.SOL_SOCKET, socket.SCM_RIGHTS, array.array('i', fds))])
+
+
+class PipeStream(BaseStream):
+    def __init__(self, pipe, loop=None):
+        """
+        Create new instance of the PipeStream class
+        :param pipe: a file descriptor or a file-like object with a fileno() method
+        """
+        super().__init__(loop)
+        self._pipe = pipe
+        self._fd = pipe if isinstance(pipe, int) else pipe.fileno()
+        os.set_blocking(self._fd, False)
+
+    def fileno(self):
+        return self._fd
+
+    def _close_fd(self, fd):
+        if isinstance(self._pipe, int):
+            os.close(self._fd)
+        else:
+            self._pipe.close()
+        self._pipe = None
+        self._fd = -1
+
+    def _read_fd(self, fd, n):
+        return os.read(fd, n)
+
+    def _write_fd(self, fd, data):
+        return os.write(fd, data)
+
+
+class TLSStream(BaseStream):
+    def __init__(self, stream, ssl_context, server_side=False, server_hostname=None, session=None,
+                 session_callback=None, read_size=16384, loop=None):
+        """
+        Create new instance of the TLSStream class
+        :param stream: the underlying SocketStream carrying the TLS records
+        :param ssl_context: the ssl.SSLContext used to create the TLS connection
+        :param session: an ssl.SSLSession to resume (client side only)
+        :param session_callback: invoked with the ssl.SSLSession after the handshake and on close (client side only)
+        """
+        if ssl is None:
+            raise RuntimeError('ssl module is not available')
+        super().__init__(loop or stream._loop)
+        self._stream = stream
+        self._read_size = read_size
+        self._session_callback = session_callback
+        self._incoming = ssl.MemoryBIO()
+        self._outgoing = ssl.MemoryBIO()
+        self._ssl = ssl_context.wrap_bio(self._incoming, self._outgoing,
+                                         server_side=server_side,
+                                         server_hostname=server_hostname,
+                                         session=session)
+        self._flush_lock = asyncio.Lock()
+
+    @property
+    def session(self):
+        return self._ssl.session
+
+    @property
+    def session_reused(self):
+        return self._ssl.session_reused
+
+    def getpeercert(self, binary_form=False):
+        return self._ssl.getpeercert(binary_form)
+
+    async def handshake(self, executor=None):
+        """
+        Perform the TLS handshake
+        :param executor: if given, run the CPU-bound handshake steps in this executor instead of on the event loop
+        :return: None
+        """
+        while True:
+            try:
+                if executor is not None:
+                    await self._loop.run_in_executor(executor, self._ssl.do_handshake)
+                else:
+                    self._ssl.do_handshake()
+            except ssl.SSLWantReadError:
+                # send our handshake records and wait for the peer's
+                await self._flush()
+                if not await self._fill():
+                    raise ConnectionResetError('Connection lost during TLS handshake')
+            else:
+                # send any remaining handshake records
+                await self._flush()
+                break
+
+        self._notify_session()
+
+    async def _fill(self):
+        """
+        Read TLS records from the underlying stream into the incoming buffer
+        :return: False if EOF was received
+        """
+        data = await self._stream.read_async(self._read_size)
+        if data is None:
+            self._incoming.write_eof()
+            return False
+        self._incoming.write(data)
+        return True
+
+    async def _flush(self):
+        """
+        Write TLS records from the outgoing buffer to the underlying stream
+        """
+        async with self._flush_lock:
+            data = self._outgoing.read()
+            if data:
+                await self._stream.write_async(data)
+
+    def _notify_session(self):
+        if self._session_callback is not None and not self._ssl.server_side:
+            session = self._ssl.session
+            if session is not None:
+                self._session_callback(session)
+
+    async def read_async(self, n):
+        """
+        Read decrypted data asynchronously
+        :param n:
+        :return: the data read, or None on EOF (a ragged EOF without close_notify is treated as EOF too)
+        """
+        if self.fileno() < 0:
+            raise StreamClosedError()
+
+        while True:
+            try:
+                data = self._ssl.read(n)
+            except ssl.SSLWantReadError:
+                if self._outgoing.pending:
+                    await self._flush()
+                # if the underlying stream hit EOF, the ssl object decides whether it was clean on the next read
+                await self._fill()
+                continue
+            except (ssl.SSLZeroReturnError, ssl.SSLEOFError):
+                # done reading (EOF received)
+                data = b''
+
+            if not data:
+                # done reading (close_notify or ragged EOF received)
+                if self._close_eof:
+                    self.close()
+                return None
+
+            # reading may have produced records to send (e.g. key updates)
+            if self._outgoing.pending:
+                await self._flush()
+            return data
+
+    async def write_async(self, data):
+        """
+        Write data asynchronously
+        :param data:
+        :return:
+        """
+        if not isinstance(data, (bytes, bytearray, memoryview)):
+            raise TypeError('data argument must be a bytes-like object, '
+                            'not %r' % type(data).__name__)
+
+        if self.fileno() < 0:
+            raise StreamClosedError()
+
+        if data:
+            self._ssl.write(data)
+        await self._flush()
+
+    def close(self):
+        if self._closing:
+            return
+        self._closing = True
+
+        self._notify_session()
+
+        # queue close_notify for the peer
+        try:
+            self._ssl.unwrap()
+        except ssl.SSLError:
+            pass
+
+        if self._flush_lock.locked():
+            # a write is in flight, send close_notify after it completes
+            self._loop.create_task(self._flush_and_close())
+            return
+
+        data = self._outgoing.read()
+        if data and self._stream.fileno() >= 0:
+            future = self._stream.write_async(data)
+            future.add_done_callback(lambda f: f.cancelled() or f.exception())
+
+        self._stream.close()
+
+    async def _flush_and_close(self):
+        try:
+            await self._flush()
+        except Exception:
+            pass
+        finally:
+            self._stream.close()
+
+    def fileno(self):
+        if self._closing:
+            return -1
+        return self._stream.fileno()
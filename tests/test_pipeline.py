@@ -0,0 +1,83 @@
+import asyncio
+import concurrent.futures
+import multiprocessing
+import os
+
+import tests
+
+import asyncstream
+
+
+def reverse_line(line):
+    return line[-2::-1] + b'\n'
+
+
+def skip_odd(line):
+    if int(line) % 2:
+        return None
+    return line
+
+
+class PipelineTestCase(tests.BaseTestCase):
+    def create_pipe(self):
+        read_fd, write_fd = os.pipe()
+        read_stream = asyncstream.PipeStream(read_fd)
+        write_stream = asyncstream.PipeStream(write_fd)
+        self.addCleanup(read_stream.close)
+        self.addCleanup(write_stream.close)
+        return read_stream, write_stream
+
+    async def run_pipeline(self, data, *stages):
+        source_read, source_write = self.create_pipe()
+        sink_read, sink_write = self.create_pipe()
+
+        pipeline = asyncstream.Pipeline(asyncstream.StreamReader(source_read),
+                                        asyncstream.StreamWriter(sink_write),
+                                        queue_size=4)
+        for func, kwargs in stages:
+            pipeline.add_stage(func, **kwargs)
+
+        async def _write_source():
+            await source_write.write_async(data)
+            source_write.close()
+
+        async def _run_pipeline():
+            await pipeline.run()
+            sink_write.close()
+
+        loop = asyncio.get_event_loop()
+        loop.create_task(_write_source())
+        run_task = loop.create_task(_run_pipeline())
+        result = await asyncstream.StreamReader(sink_read, buffer_size=len(data) * 2).read_until_eof()
+        await run_task
+        return pipeline, result
+
+    async def test_run(self):
+        data = b''.join(b'%d\n' % i for i in range(1000))
+        pipeline, result = await self.run_pipeline(data, (skip_odd, {}))
+        self.assertEqual(result, b''.join(b'%d\n' % i for i in range(0, 1000, 2)))
+
+        stats = pipeline.stats[0]
+        self.assertEqual(stats.name, 'skip_odd')
+        self.assertEqual(stats.records_in, 1000)
+        self.assertEqual(stats.records_out, 500)
+
+    async def test_run_without_separator(self):
+        pipeline, result = await self.run_pipeline(b'a\nb\nlast', (bytes.upper, {}))
+        self.assertEqual(result, b'A\nB\nLAST')
+        self.assertEqual(pipeline.stats[0].records_in, 3)
+
+    async def test_run_executor(self):
+        data = b''.join(b'%d\n' % i for i in range(1000))
+        with concurrent.futures.ThreadPoolExecutor(max_workers=2) as thread_pool, \
+                concurrent.futures.ProcessPoolExecutor(
+                    max_workers=2, mp_context=multiprocessing.get_context('spawn')) as process_pool:
+            pipeline, result = await self.run_pipeline(
+                data,
+                (skip_odd, dict(executor=thread_pool, concurrency=2, batch_size=16)),
+                (reverse_line, dict(executor=process_pool, concurrency=2, batch_size=16)))
+
+        expected = [(b'%d' % i)[::-1] for i in range(0, 1000, 2)]
+        self.assertEqual(sorted(result.splitlines()), sorted(expected))
+        self.assertEqual([stats.records_in for stats in pipeline.stats], [1000, 500])
+        self.assertTrue(all(stats.batches <= stats.records_in for stats in pipeline.stats))
@@ -1,15 +1,22 @@
+import asyncio
+import concurrent.futures
+import os
 import socket
+import ssl
+import tempfile
 
 import asyncstream
 import asyncstream.factory
 
 import tests
 
+CERTFILE = os.path.join(os.path.dirname(__file__), 'keycert.pem')
+
 
 class ServerTestCase(tests.BaseTestCase):
-    async def create_server(self, callback):
+    async def create_server(self, callback, **kwargs):
         server_addr = ('127.0.0.1', None)
-        server = asyncstream.factory.Server(callback)
+        server = asyncstream.factory.Server(callback, **kwargs)
         await server.listen(*server_addr)
         self.addCleanup(lambda: server.close())
 
@@ -35,3 +42,101 @@ class ServerTestCase(tests.BaseTestCase):
         data = await reader.read(1024)
         self.assertEqual(data, b'hello world')
 
+    async def test_server_unix(self):
+        async def _handle_connection(stream, addr):
+            writer = asyncstream.StreamWriter(stream)
+            await writer.write(b'hello world')
+            stream.close()
+
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        path = os.path.join(tmpdir.name, 'asyncstream.sock')
+        server = asyncstream.factory.Server(_handle_connection)
+        await server.listen_unix(path)
+        self.addCleanup(lambda: server.close())
+
+        stream = await asyncstream.factory.Client().connect_unix(path)
+        self.assertIsInstance(stream, asyncstream.UnixStream)
+        reader = asyncstream.StreamReader(stream)
+
+        data = await reader.read(1024)
+        self.assertEqual(data, b'hello world')
+
+    async def test_server_tls(self):
+        async def _handle_connection(stream, addr):
+            writer = asyncstream.StreamWriter(stream)
+            await writer.write(b'hello world')
+            stream.close()
+
+        server_context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        server_context.load_cert_chain(CERTFILE)
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=2)
+        self.addCleanup(executor.shutdown)
+        server, server_addr = await self.create_server(_handle_connection,
+                                                       ssl_context=server_context,
+                                                       handshake_executor=executor)
+
+        client_context = ssl.create_default_context(cafile=CERTFILE)
+        client = asyncstream.factory.Client()
+        for session_reused in (False, True):
+            stream = await client.connect_tls(server_addr[0], server_addr[1], client_context,
+                                              server_hostname='localhost', handshake_executor=executor)
+            reader = asyncstream.StreamReader(stream)
+
+            data = await reader.read_until_eof()
+            self.assertEqual(data, b'hello world')
+            self.assertEqual(stream.session_reused, session_reused)
+            stream.close()
+
+    async def test_server_tls_contexts(self):
+        async def _handle_connection(stream, addr):
+            writer = asyncstream.StreamWriter(stream)
+            await writer.write(b'hello world')
+            stream.close()
+
+        server_context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        server_context.load_cert_chain(CERTFILE)
+        server, server_addr = await self.create_server(_handle_connection, ssl_context=server_context)
+
+        client = asyncstream.factory.Client()
+        for _ in range(2):
+            client_context = ssl.create_default_context(cafile=CERTFILE)
+            for session_reused in (False, True):
+                stream = await client.connect_tls(server_addr[0], server_addr[1], client_context,
+                                                  server_hostname='localhost')
+                reader = asyncstream.StreamReader(stream)
+
+                data = await reader.read_until_eof()
+                self.assertEqual(data, b'hello world')
+                self.assertEqual(stream.session_reused, session_reused)
+                stream.close()
+
+    async def test_server_tls_read_until(self):
+        async def _handle_connection(stream, addr):
+            writer = asyncstream.StreamWriter(stream)
+            await writer.write(b'line1\npartial')
+            stream.close()
+
+        server_context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        server_context.load_cert_chain(CERTFILE)
+        server, server_addr = await self.create_server(_handle_connection, ssl_context=server_context)
+
+        client_context = ssl.create_default_context(cafile=CERTFILE)
+        stream = await asyncstream.factory.Client().connect_tls(server_addr[0], server_addr[1], client_context,
+                                                               server_hostname='localhost')
+        self.addCleanup(stream.close)
+        reader = asyncstream.StreamReader(stream)
+
+        self.assertEqual(await asyncio.wait_for(reader.read_until(b'\n'), 5), b'line1\n')
+        self.assertEqual(await asyncio.wait_for(reader.read_until(b'\n'), 5), b'')
+        self.assertEqual(reader.read_buffered(), b'partial')
+
+    async def test_server_tls_handshake_timeout(self):
+        server_context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        server_context.load_cert_chain(CERTFILE)
+        server, server_addr = await self.create_server(None, ssl_context=server_context, handshake_timeout=0.1)
+
+        # connect without sending a client hello
+        stream = await self.create_socket_stream(server_addr)
+        self.addCleanup(stream.close)
+        self.assertEqual(await asyncio.wait_for(stream.read_async(1024), 5), None)
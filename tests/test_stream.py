@@ -1,4 +1,7 @@
 import asyncio
+import os
+import socket
+
 import tests
 
 import asyncstream
@@ -46,3 +49,77 @@ class SocketStreamTestCase(tests.BaseTestCase):
             pass
         else:
             self.fail("StreamClosed not raised")
+
+
+class UnixStreamTestCase(tests.BaseTestCase):
+    async def test_read_write_fds_async(self):
+        sock1, sock2 = socket.socketpair(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock1.setblocking(False)
+        sock2.setblocking(False)
+        stream1 = asyncstream.UnixStream(sock1)
+        stream2 = asyncstream.UnixStream(sock2)
+        self.addCleanup(stream1.close)
+        self.addCleanup(stream2.close)
+
+        read_fd, write_fd = os.pipe()
+        self.addCleanup(os.close, read_fd)
+        os.write(write_fd, b'hello')
+        os.close(write_fd)
+
+        await stream1.write_fds_async(b'fd', [read_fd])
+        data, fds = await stream2.read_fds_async(1024, 1)
+        self.assertEqual(data, b'fd')
+        self.assertEqual(len(fds), 1)
+        with os.fdopen(fds[0], 'rb') as f:
+            self.assertEqual(f.read(), b'hello')
+
+    async def test_write_fds_async_close(self):
+        sock1, sock2 = socket.socketpair(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock1.setblocking(False)
+        sock2.setblocking(False)
+        stream1 = asyncstream.UnixStream(sock1)
+        stream2 = asyncstream.UnixStream(sock2)
+        self.addCleanup(stream2.close)
+
+        read_fd, write_fd = os.pipe()
+        self.addCleanup(os.close, read_fd)
+        self.addCleanup(os.close, write_fd)
+
+        # fill the send buffer so that the write is deferred
+        filler = 0
+        try:
+            while True:
+                filler += sock1.send(b'\0' * 65536)
+        except BlockingIOError:
+            pass
+
+        future = stream1.write_fds_async(b'fd', [read_fd])
+        stream1.close()
+        self.assertFalse(future.done())
+
+        data = b''
+        fds = []
+        while len(data) < filler + 2:
+            chunk, chunk_fds = await stream2.read_fds_async(65536, 1)
+            self.assertIsNotNone(chunk)
+            data += chunk
+            fds += chunk_fds
+        await future
+        self.assertEqual(data[filler:], b'fd')
+        self.assertEqual(len(fds), 1)
+        os.close(fds[0])
+        self.assertEqual(stream1.fileno(), -1)
+
+
+class PipeStreamTestCase(tests.BaseTestCase):
+    async def test_read_write_async(self):
+        read_fd, write_fd = os.pipe()
+        read_stream = asyncstream.PipeStream(read_fd)
+        write_stream = asyncstream.PipeStream(write_fd)
+        self.addCleanup(read_stream.close)
+        self.addCleanup(write_stream.close)
+
+        await write_stream.write_async(b'hello')
+        self.assertEqual(await read_stream.read_async(1024), b'hello')
+        write_stream.close()
+        self.assertEqual(await read_stream.read_async(1024), None)